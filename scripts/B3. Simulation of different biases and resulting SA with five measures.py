@@ -53,7 +53,9 @@ def sa_cooke(vals, quantiles):
     return c
 
 
-if __name__ == "__main__":
+def simulate(sa_methods, samples, outdir):
+    """Sample the four hypothetical experts and calculate their statistical accuracy with the
+    given SA methods, for an increasing number of items. The scores are exported to outdir."""
 
     np.seterr(under="print")
 
@@ -65,14 +67,6 @@ if __name__ == "__main__":
         CalibrationMethod.AD: lambda x: anderson_darling.ad_sa(x),
     }
 
-    sa_methods = [
-        CalibrationMethod.CRPS,
-        CalibrationMethod.Chi2,
-        CalibrationMethod.CVM,
-        CalibrationMethod.KS,
-        CalibrationMethod.AD,
-    ]
-
     experts = {
         "Perfectly calibrated": (1.0, 1.0),
         "Overconfident": (0.35, 0.35),
@@ -81,13 +75,10 @@ if __name__ == "__main__":
     }
 
     N = 50
-    # SET THE SAMPLES HERE TO CONTROL SIMULATION TIME
-    samples = 10000
     quantiles = np.array([0.05, 0.5, 0.95])
     # quantiles = np.array([0.05, 0.25, 0.5, 0.75, 0.95])
     npoints = list(range(3, N + 1))
 
-    allvals = []
     calis = {}
 
     for sa_method in sa_methods:
@@ -96,17 +87,31 @@ if __name__ == "__main__":
             calis[sa_method.value][name] = []
 
     for name, (a, b) in experts.items():
-        
+
         for j in tqdm(range(samples), desc=name):
 
             cdfvals = np.random.beta(a=a, b=b, size=N)
-            # allvals.append(cdfvals)
 
             for sa_method in sa_methods:
 
                 sa = [sa_function[sa_method](cdfvals[:i]) for i in npoints]
                 calis[sa_method.value][name].append(sa)
 
-
-    with open(Path(__file__).parent / ".." / "data" / "results" / "sampled_sa_scores.json", "w") as f:
+    with open(outdir / "sampled_sa_scores.json", "w") as f:
         json.dump(calis, f, indent=4)
+
+
+if __name__ == "__main__":
+
+    sa_methods = [
+        CalibrationMethod.CRPS,
+        CalibrationMethod.Chi2,
+        CalibrationMethod.CVM,
+        CalibrationMethod.KS,
+        CalibrationMethod.AD,
+    ]
+
+    # SET THE SAMPLES HERE TO CONTROL SIMULATION TIME
+    samples = 10000
+
+    simulate(sa_methods, samples, Path(__file__).parent / ".." / "data" / "results")
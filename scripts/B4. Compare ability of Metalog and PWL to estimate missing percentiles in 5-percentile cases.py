@@ -7,99 +7,87 @@ import json
 import numpy as np
 from io import StringIO
 import anduryl
-from anduryl.io.settings import Distribution
 
 workingdir = Path(__file__).parent
 
-# Read settings
-with open(workingdir / "settings.json", "r") as f:
-    dict = json.load(f)
-
-files = dict["files"]
-
-distributions = [Distribution.PWL, Distribution.METALOG]
-
-table = {method: {key: {} for key in files} for method in distributions}
+casefolder = workingdir / '..' / "data" / 'case-studies'
 
-scores = {}
-percentiles = {}
 
-casefolder = workingdir / '..' / "data" / 'case-studies'
+def compare_percentiles(files, outdir):
+    """Estimate the removed 2nd and 4th percentile of the 5-percentile cases with Metalog and PWL,
+    and export the differences with the actual percentiles to outdir."""
+    diffs = {
+        "25p_pwl": [],
+        "25p_ml": [],
+        "75p_pwl": [],
+        "75p_ml": [],
+    }
 
-# Create a EQ DM to enable plot data
-# Read settings
-with open(Path(__file__).parent / "settings.json", "r") as f:
-    dict = json.load(f)
-files = dict["files"]
+    # For each case
+    for key in tqdm(files, total=len(files)):
+        project = anduryl.Project()
+        project.io.load_excalibur(casefolder / f"{key}.dtt", casefolder / f"{key}.rls")
 
-diffs = {
-    "25p_pwl": [],
-    "25p_ml": [],
-    "75p_pwl": [],
-    "75p_ml": [],
-}
+        # Only consider 5 percentile cases
+        if len(project.assessments.quantiles) == 3:
+            continue
 
-plot = False
+        # Save a 3 percentile version of the project
+        sio = StringIO()
 
-# For each case
-for key in tqdm(files, total=len(files)):
-    scores[key] = {}
-    percentiles[key] = {}
+        # Remove the second and fourth percentile from the project
+        project.assessments.remove_quantile(project.assessments.quantiles[3])
+        project.assessments.remove_quantile(project.assessments.quantiles[1])
 
-    project = anduryl.Project()
-    project.io.load_excalibur(casefolder / f"{key}.dtt", casefolder / f"{key}.rls")
+        savemodel = project.io.to_savemodel()
+        sio.write(savemodel.model_dump_json())
 
-    # Only consider 5 percentile cases
-    if len(project.assessments.quantiles) == 3:
-        continue
+        project_3p = anduryl.Project()
+        sio.seek(0)
+        project_3p.io.load_json(sio)
+        sio.close()
 
-    # Save a 3 percentile version of the project
-    sio = StringIO()
+        project_5p = anduryl.Project()
+        project_5p.io.load_excalibur(casefolder / f"{key}.dtt", casefolder / f"{key}.rls")
 
-    # Remove the second and fourth percentile from the project
-    project.assessments.remove_quantile(project.assessments.quantiles[3])
-    project.assessments.remove_quantile(project.assessments.quantiles[1])
+        lower, upper = project_5p.assessments.get_bounds()
 
-    savemodel = project.io.to_savemodel()
-    sio.write(savemodel.model_dump_json())
+        for exp, exp_estimates in project_5p.assessments.estimates.items():
+            for i, (item, est_obj) in enumerate(exp_estimates.items()):
+                if project.items.scales[i] == "log":
+                    continue
 
-    project_3p = anduryl.Project()
-    sio.seek(0)
-    project_3p.io.load_json(sio)
-    sio.close()
+                est_3p = project_3p.assessments.estimates[exp][item]
+                if None in list(est_3p.estimates.values()):
+                    continue
 
-    project_5p = anduryl.Project()
-    project_5p.io.load_excalibur(casefolder / f"{key}.dtt", casefolder / f"{key}.rls")
+                if np.isnan(list(est_3p.estimates.values())).any():
+                    continue
 
-    lower, upper = project_5p.assessments.get_bounds()
+                q_2nd_est = project_5p.assessments.quantiles[1]
+                est_2nd_p = est_obj.estimates[q_2nd_est]
+                q_2nd_int_ml = est_3p._cdf_metalog(est_2nd_p)
+                q_2nd_int_pwl = est_3p._cdf_pwl(est_2nd_p, lower=lower[i], upper=upper[i])
+                diffs["25p_pwl"].append(q_2nd_int_pwl - q_2nd_est)
+                diffs["25p_ml"].append(q_2nd_int_ml - q_2nd_est)
 
-    for exp, exp_estimates in project_5p.assessments.estimates.items():
-        for i, (item, est_obj) in enumerate(exp_estimates.items()):
-            if project.items.scales[i] == "log":
-                continue
+                q_4th_est = project_5p.assessments.quantiles[-2]
+                est_4th_p = est_obj.estimates[q_4th_est]
+                q_4th_int_ml = est_3p._cdf_metalog(est_4th_p)
+                q_4th_int_pwl = est_3p._cdf_pwl(est_4th_p, lower=lower[i], upper=upper[i])
+                diffs["75p_pwl"].append(q_4th_int_pwl - q_4th_est)
+                diffs["75p_ml"].append(q_4th_int_ml - q_4th_est)
 
-            est_3p = project_3p.assessments.estimates[exp][item]
-            if None in list(est_3p.estimates.values()):
-                continue
 
-            if np.isnan(list(est_3p.estimates.values())).any():
-                continue
+    # Add to dataframe and export
+    with open(outdir / "differences_3p_5p.json", "w") as f:
+        json.dump(diffs, f, indent=4)
 
-            q_2nd_est = project_5p.assessments.quantiles[1]
-            est_2nd_p = est_obj.estimates[q_2nd_est]
-            q_2nd_int_ml = est_3p._cdf_metalog(est_2nd_p)
-            q_2nd_int_pwl = est_3p._cdf_pwl(est_2nd_p, lower=lower[i], upper=upper[i])
-            diffs["25p_pwl"].append(q_2nd_int_pwl - q_2nd_est)
-            diffs["25p_ml"].append(q_2nd_int_ml - q_2nd_est)
 
-            q_4th_est = project_5p.assessments.quantiles[-2]
-            est_4th_p = est_obj.estimates[q_4th_est]
-            q_4th_int_ml = est_3p._cdf_metalog(est_4th_p)
-            q_4th_int_pwl = est_3p._cdf_pwl(est_4th_p, lower=lower[i], upper=upper[i])
-            diffs["75p_pwl"].append(q_4th_int_pwl - q_4th_est)
-            diffs["75p_ml"].append(q_4th_int_ml - q_4th_est)
+if __name__ == "__main__":
 
+    # Read settings
+    with open(workingdir / "settings.json", "r") as f:
+        settings_dict = json.load(f)
 
-# Add to dataframe and export
-with open(workingdir / '..' / "data" / "Results" / "differences_3p_5p.json", "w") as f:
-    json.dump(diffs, f, indent=4)
+    compare_percentiles(settings_dict["files"], workingdir / '..' / "data" / "results")
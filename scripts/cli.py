@@ -0,0 +1,253 @@
+"""Command-line entry point for the B1-B5 workloads.
+
+Each script is exposed as a subcommand that can be restricted to a subset of the
+cases, statistical accuracy (SA) methods, distributions and DM settings, e.g.:
+
+    python scripts/cli.py b1 --cases Arkansas --methods CRPS --distributions PWL --settings GL
+
+The subcommands call the functions defined in the B-scripts, so both give the same results.
+Heavy modules (anduryl, pandas, scipy, matplotlib, tqdm) are only imported when the script
+for the selected subcommand is loaded, so argument parsing and a targeted re-score start fast.
+The startup time and total run time are reported on stderr.
+
+An unfiltered run writes to the same location as the script. A filtered run writes to a
+"cli" subdirectory of that location, so it does not overwrite the full-study results.
+"""
+
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+maindir = Path(__file__).parent / ".."
+resultsfolder = maindir / "data" / "results"
+figuresfolder = maindir / "data" / "figures" / "3p_5p_comparison"
+settingsfile = Path(__file__).parent / "settings.json"
+
+# Names of the anduryl enum members, kept as strings so parsing does not import anduryl
+SA_METHODS = ["Chi2", "CRPS", "KS", "CVM", "AD"]
+DISTRIBUTIONS = ["METALOG", "PWL"]
+
+# The selections each script uses by default. For the DM settings, these are also the only
+# ones supported: the user weights DM (US) is only used internally for cross-comparison.
+DEFAULTS = {
+    "b1": {"methods": SA_METHODS, "distributions": ["METALOG", "PWL"], "settings": ["GLopt", "GL", "EQ"]},
+    "b2": {"methods": SA_METHODS, "distributions": ["PWL", "METALOG"], "settings": ["GL", "GLopt"]},
+    "b3": {"methods": ["CRPS", "Chi2", "CVM", "KS", "AD"], "samples": 10000},
+    "b5": {"cases": ["Arkansas", "bfiq", "CoveringKids"]},
+}
+
+# Arguments that restrict a run to part of the full study
+FILTERS = ["cases", "methods", "distributions", "settings", "samples"]
+
+
+def _choice(options):
+    """Argparse type that matches an option case-insensitively and returns its canonical name."""
+    lookup = {option.lower(): option for option in options}
+
+    def convert(value):
+        try:
+            return lookup[value.lower()]
+        except KeyError:
+            raise argparse.ArgumentTypeError(f"invalid choice: '{value}' (choose from {', '.join(options)})")
+
+    return convert
+
+
+def _positive_int(value):
+    """Argparse type for a strictly positive integer."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"invalid positive integer: '{value}'")
+    return number
+
+
+def _read_config(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _select(requested, available, what):
+    """Return the requested subset of available without duplicates, in the order requested,
+    or all available if none requested."""
+    if not requested:
+        return list(available)
+    unknown = [item for item in requested if item not in available]
+    if unknown:
+        raise SystemExit(f"error: unknown {what}: {', '.join(unknown)} (choose from {', '.join(available)})")
+    return list(dict.fromkeys(requested))
+
+
+def _selection(args, name, available=None):
+    """Select the values for a filter argument, falling back to the subcommand's default."""
+    default = DEFAULTS.get(args.command, {}).get(name)
+    return _select(getattr(args, name) or default, available or default, name)
+
+
+def _is_filtered(args):
+    return any(getattr(args, name, None) is not None for name in FILTERS)
+
+
+def _outdir(args, default):
+    """Output directory: --outdir if given, a "cli" subdirectory of the default for a filtered run,
+    the default otherwise."""
+    if args.outdir is not None:
+        outdir = args.outdir
+    elif _is_filtered(args):
+        outdir = default / "cli"
+    else:
+        outdir = default
+    outdir.mkdir(parents=True, exist_ok=True)
+    return outdir
+
+
+def _load_script(prefix):
+    """Load one of the B-scripts as a module. Their driver code is guarded by `__name__ == "__main__"`."""
+    (path,) = Path(__file__).parent.glob(f"{prefix}. *.py")
+    spec = importlib.util.spec_from_file_location(prefix, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _sa_methods(args):
+    from anduryl.io.settings import CalibrationMethod
+
+    return [CalibrationMethod[name] for name in _selection(args, "methods")]
+
+
+def _distributions(args):
+    from anduryl.io.settings import Distribution
+
+    return [Distribution[name] for name in _selection(args, "distributions")]
+
+
+def run_b1(args):
+    """DM statistical accuracy and combination score, cross-comparing SA methods and distributions (B1)."""
+    config = _read_config(args.config)
+    files = _selection(args, "cases", config["files"])
+    setting_names = _selection(args, "settings")
+
+    b1 = _load_script("B1")
+
+    setting_options = [b1.CalculationSettings(**config["settings"][name]) for name in setting_names]
+    user_settings = b1.CalculationSettings(**config["settings"]["US"])
+    b1.calculate_dm_scores(
+        files, _sa_methods(args), _distributions(args), setting_options, user_settings, _outdir(args, resultsfolder)
+    )
+
+
+def run_b2(args):
+    """Statistical accuracy, weights and realization percentiles for all experts (B2)."""
+    config = _read_config(args.config)
+    files = _selection(args, "cases", config["files"])
+    setting_names = _selection(args, "settings")
+
+    b2 = _load_script("B2")
+
+    setting_options = [b2.CalculationSettings(**config["settings"][name]) for name in setting_names]
+    b2.calculate_scores(files, _sa_methods(args), _distributions(args), setting_options, _outdir(args, resultsfolder))
+
+
+def run_b3(args):
+    """Simulated experts with different biases, scored with the SA methods (B3)."""
+    b3 = _load_script("B3")
+
+    b3.simulate(_sa_methods(args), args.samples or DEFAULTS["b3"]["samples"], _outdir(args, resultsfolder))
+
+
+def run_b4(args):
+    """Ability of Metalog and PWL to estimate the missing percentiles in 5-percentile cases (B4)."""
+    config = _read_config(args.config)
+    files = _selection(args, "cases", config["files"])
+
+    b4 = _load_script("B4")
+
+    b4.compare_percentiles(files, _outdir(args, resultsfolder))
+
+
+def run_b5(args):
+    """Figures of fitted Metalog and PWL distributions for 5-percentile cases (B5)."""
+    config = _read_config(args.config)
+    files = _selection(args, "cases", config["files"])
+
+    b5 = _load_script("B5")
+
+    b5.plot_fits(files, b5.CalculationSettings(**config["settings"]["EQ"]), _outdir(args, figuresfolder))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the B1-B5 workloads for a selection of cases and methods.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--outdir",
+        type=Path,
+        default=None,
+        help="Output directory (default: the script's own, in a 'cli' subdirectory for filtered runs)",
+    )
+
+    cases = argparse.ArgumentParser(add_help=False)
+    cases.add_argument("--cases", nargs="+", metavar="CASE", help="Cases from settings.json to process (default: all)")
+    cases.add_argument("--config", default=settingsfile, type=Path, help="Path to settings.json")
+
+    methods = argparse.ArgumentParser(add_help=False)
+    methods.add_argument(
+        "--methods", nargs="+", type=_choice(SA_METHODS), metavar="METHOD", help=f"SA methods ({', '.join(SA_METHODS)})"
+    )
+
+    distributions = argparse.ArgumentParser(add_help=False)
+    distributions.add_argument(
+        "--distributions",
+        nargs="+",
+        type=_choice(DISTRIBUTIONS),
+        metavar="DIST",
+        help=f"Distributions ({', '.join(DISTRIBUTIONS)})",
+    )
+
+    commands = [
+        ("b1", run_b1, [common, cases, methods, distributions]),
+        ("b2", run_b2, [common, cases, methods, distributions]),
+        ("b3", run_b3, [common, methods]),
+        ("b4", run_b4, [common, cases]),
+        ("b5", run_b5, [common, cases]),
+    ]
+    for name, func, parents in commands:
+        subparser = subparsers.add_parser(name, parents=parents, help=func.__doc__, description=func.__doc__)
+        subparser.set_defaults(func=func)
+
+    for name in ["b1", "b2"]:
+        options = DEFAULTS[name]["settings"]
+        subparsers.choices[name].add_argument(
+            "--settings",
+            nargs="+",
+            type=_choice(options),
+            metavar="DM",
+            help=f"DM settings from settings.json ({', '.join(options)})",
+        )
+
+    subparsers.choices["b3"].add_argument(
+        "--samples", type=_positive_int, help=f"Number of samples per expert (default: {DEFAULTS['b3']['samples']})"
+    )
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    print(f"startup: {time.perf_counter() - _START:.3f} s", file=sys.stderr)
+    args.func(args)
+    print(f"total: {time.perf_counter() - _START:.3f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Tests for the argument parsing and selection logic of scripts/cli.py. These do not need anduryl."""
+
+import importlib.util
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+scriptsdir = Path(__file__).parent / ".." / "scripts"
+
+spec = importlib.util.spec_from_file_location("cli", scriptsdir / "cli.py")
+cli = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(cli)
+
+
+def parse(*argv):
+    return cli.build_parser().parse_args(list(argv))
+
+
+def test_unknown_case_is_rejected():
+    args = parse("b1", "--cases", "Arkansas", "Nowhere")
+    with pytest.raises(SystemExit, match="Nowhere"):
+        cli._selection(args, "cases", cli._read_config(args.config)["files"])
+
+
+def test_cases_are_deduplicated_in_order():
+    args = parse("b4", "--cases", "bfiq", "Arkansas", "bfiq")
+    assert cli._selection(args, "cases", cli._read_config(args.config)["files"]) == ["bfiq", "Arkansas"]
+
+
+def test_methods_match_case_insensitively_and_are_deduplicated():
+    args = parse("b3", "--methods", "crps", "CRPS", "chi2")
+    assert args.methods == ["CRPS", "CRPS", "Chi2"]
+    assert cli._selection(args, "methods") == ["CRPS", "Chi2"]
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(SystemExit):
+        parse("b1", "--methods", "Brier")
+
+
+def test_unsupported_settings_are_rejected():
+    with pytest.raises(SystemExit):
+        parse("b1", "--settings", "US")
+    with pytest.raises(SystemExit):
+        parse("b2", "--settings", "EQ")
+    assert parse("b2", "--settings", "glopt").settings == ["GLopt"]
+
+
+@pytest.mark.parametrize("samples", ["0", "-5", "ten"])
+def test_samples_must_be_positive(samples):
+    with pytest.raises(SystemExit):
+        parse("b3", "--samples", samples)
+
+
+def test_defaults_match_scripts():
+    # The lists used by the drivers of the B-scripts
+    expected = {
+        ("b1", "methods"): ["Chi2", "CRPS", "KS", "CVM", "AD"],
+        ("b1", "distributions"): ["METALOG", "PWL"],
+        ("b1", "settings"): ["GLopt", "GL", "EQ"],
+        ("b2", "methods"): ["Chi2", "CRPS", "KS", "CVM", "AD"],
+        ("b2", "distributions"): ["PWL", "METALOG"],
+        ("b2", "settings"): ["GL", "GLopt"],
+        ("b3", "methods"): ["CRPS", "Chi2", "CVM", "KS", "AD"],
+        ("b5", "cases"): ["Arkansas", "bfiq", "CoveringKids"],
+    }
+    for (command, name), values in expected.items():
+        assert cli._selection(parse(command), name) == values
+    assert cli.DEFAULTS["b3"]["samples"] == 10000
+
+    args = parse("b1")
+    files = cli._read_config(args.config)["files"]
+    assert cli._selection(args, "cases", files) == files
+
+
+def test_outdir_for_filtered_runs(tmp_path):
+    assert cli._outdir(parse("b4"), tmp_path) == tmp_path
+    assert cli._outdir(parse("b4", "--cases", "Arkansas"), tmp_path) == tmp_path / "cli"
+    assert cli._outdir(parse("b3", "--samples", "10"), tmp_path) == tmp_path / "cli"
+    assert cli._outdir(parse("b1", "--methods", "CRPS", "--outdir", str(tmp_path / "x")), tmp_path) == tmp_path / "x"
+
+
+def test_parsing_does_not_import_heavy_modules():
+    code = (
+        "import sys, importlib.util\n"
+        f"spec = importlib.util.spec_from_file_location('cli', {str(scriptsdir / 'cli.py')!r})\n"
+        "cli = importlib.util.module_from_spec(spec)\n"
+        "spec.loader.exec_module(cli)\n"
+        "cli.build_parser().parse_args(['b1', '--cases', 'Arkansas', '--methods', 'CRPS', '--settings', 'GL'])\n"
+        "heavy = ['anduryl', 'numpy', 'pandas', 'scipy', 'matplotlib', 'tqdm']\n"
+        "print([name for name in heavy if name in sys.modules])\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"